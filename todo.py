@@ -5,14 +5,34 @@ Created on Fri Feb 14 09:40:52 2025
 @author: Al-Husseini Rayan
 """
 
+import atexit
+import csv
 import json
 import os
+import signal
+import sys
+import time
+from array import array
+from collections import Counter
 from datetime import datetime
+from itertools import compress, repeat
+from json.encoder import encode_basestring_ascii
+from operator import contains, not_
 from shutil import copy2
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional streaming parser for large task files
+    ijson = None
+
 class Priority(Enum):
     """Task priority levels.
     
@@ -22,6 +42,16 @@ class Priority(Enum):
     MEDIUM = "medium"
     HIGH = "high"
 
+# Priorities are stored in TaskStore as small integer codes (0=low, 2=high)
+PRIORITY_LEVELS = (Priority.LOW, Priority.MEDIUM, Priority.HIGH)
+PRIORITY_CODES = {p: code for code, p in enumerate(PRIORITY_LEVELS)}
+PRIORITY_NAMES = tuple(p.value for p in PRIORITY_LEVELS)
+# Stored priority string to priority level, avoiding Enum value lookup
+PRIORITY_BY_NAME = {p.value: p for p in PRIORITY_LEVELS}
+PRIORITY_ICONS = ("🟢", "🟡", "🔴")
+# Menu input ("1"-"3") to priority level
+PRIORITY_CHOICES = {str(code + 1): p for code, p in enumerate(PRIORITY_LEVELS)}
+
 @dataclass
 class Task:
     """A task in the todo list.
@@ -44,39 +74,320 @@ class Task:
     color: Optional[str] = None
     
     def to_dict(self) -> Dict:
-        data = asdict(self)
-        data['priority'] = self.priority.value
-        return data
+        return {
+            'title': self.title,
+            'completed': self.completed,
+            'priority': self.priority.value,
+            'due_date': self.due_date,
+            'category': self.category,
+            'description': self.description,
+            'color': self.color,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Task':
-        if 'priority' in data:
-            data['priority'] = Priority(data['priority'])
+        priority = data.get('priority', Priority.MEDIUM)
+        if not isinstance(priority, Priority):
+            try:
+                priority = PRIORITY_BY_NAME[priority]
+            except (KeyError, TypeError):
+                raise ValueError(f"Invalid priority: {priority!r}") from None
+            data = {**data, 'priority': priority}
         return cls(**data)
 
+class TaskStore:
+    """Column-oriented storage for the todo list.
+    
+    Every task field lives in its own list, so filtering, sorting and
+    statistics sweep a single column instead of touching every Task.
+    Rows are addressed by their position, which is also the task number
+    shown to the user minus one.
+    
+    Attributes:
+        titles (List[str]): Task titles.
+        title_lower (List[str]): Lowercase titles, kept in sync with
+            `titles` so lookups and searches never re-lower them.
+        completed (bytearray): Completion flags, one byte per task.
+        priorities (array): Priority codes as unsigned bytes, indexing
+            into PRIORITY_LEVELS.
+        due_dates (List[Optional[str]]): Due dates in YYYY-MM-DD format.
+        categories (List[str]): Task categories, interned so rows with
+            the same category share one string object.
+        descriptions (List[Optional[str]]): Additional task details.
+        colors (List[Optional[str]]): Color codes.
+        index (Dict[str, int]): Lowercase titles mapped to their rows.
+            A loaded file may repeat a title ignoring case; the index
+            then points at the first such row.
+    
+    Note:
+        Mutations are not written to disk immediately. Callers mark the
+        store dirty and `flush` writes it out once. Rows must only be
+        changed through the store's methods, which keep the title index
+        in sync and drop cached columns such as `search_text`.
+    """
+    
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self.titles: List[str] = []
+        self.title_lower: List[str] = []
+        self.completed = bytearray()
+        self.priorities = array("B")
+        self.due_dates: List[Optional[str]] = []
+        self.categories: List[str] = []
+        self.descriptions: List[Optional[str]] = []
+        self.colors: List[Optional[str]] = []
+        self.index: Dict[str, int] = {}
+        # Index keys held by more than one row at some point
+        self._shared_keys: Set[str] = set()
+        self._dirty = False
+        self._search_text: Optional[List[str]] = None
+        for task in tasks:
+            self.append(task)
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+    
+    def __getitem__(self, row: int) -> Task:
+        return Task(
+            title=self.titles[row],
+            completed=bool(self.completed[row]),
+            priority=PRIORITY_LEVELS[self.priorities[row]],
+            due_date=self.due_dates[row],
+            category=self.categories[row],
+            description=self.descriptions[row],
+            color=self.colors[row]
+        )
+    
+    def __iter__(self) -> Iterator[Task]:
+        return (self[row] for row in range(len(self)))
+    
+    def append(self, task: Task) -> None:
+        """Add a task as a new row at the end of the store."""
+        key = task.title.lower()
+        self._invalidate()
+        if self.index.setdefault(key, len(self.titles)) != len(self.titles):
+            self._shared_keys.add(key)
+        self.titles.append(task.title)
+        self.title_lower.append(key)
+        self.completed.append(task.completed)
+        self.priorities.append(PRIORITY_CODES[task.priority])
+        self.due_dates.append(task.due_date)
+        self.categories.append(sys.intern(task.category))
+        self.descriptions.append(task.description)
+        self.colors.append(task.color)
+    
+    def pop(self, row: int) -> Task:
+        """Remove a row and return it as a Task.
+        
+        Rows after the removed one shift down by one, and the title index
+        is renumbered to match.
+        """
+        task = self[row]
+        old_key = self.title_lower[row]
+        self._invalidate()
+        for column in (self.titles, self.title_lower, self.completed,
+                       self.priorities, self.due_dates, self.categories,
+                       self.descriptions, self.colors):
+            del column[row]
+        if self.index.get(old_key) == row:
+            del self.index[old_key]
+        for key, pos in self.index.items():
+            if pos > row:
+                self.index[key] = pos - 1
+        self._reindex(old_key)
+        return task
+    
+    def set_title(self, row: int, title: str) -> None:
+        """Rename a row, keeping the title index in sync."""
+        old_key = self.title_lower[row]
+        key = title.lower()
+        self._invalidate()
+        if self.index.get(old_key) == row:
+            del self.index[old_key]
+        if self.index.setdefault(key, row) != row:
+            self._shared_keys.add(key)
+        self.titles[row] = title
+        self.title_lower[row] = key
+        self._reindex(old_key)
+    
+    def set_completed(self, row: int, completed: bool) -> None:
+        """Mark a row completed or pending."""
+        self._invalidate()
+        self.completed[row] = completed
+    
+    def set_priority(self, row: int, priority: Priority) -> None:
+        """Change a row's priority level."""
+        self._invalidate()
+        self.priorities[row] = PRIORITY_CODES[priority]
+    
+    def set_due_date(self, row: int, due_date: Optional[str]) -> None:
+        """Change a row's due date."""
+        self._invalidate()
+        self.due_dates[row] = due_date
+    
+    def set_category(self, row: int, category: str) -> None:
+        """Change a row's category."""
+        self._invalidate()
+        self.categories[row] = sys.intern(category)
+    
+    def set_description(self, row: int, description: Optional[str]) -> None:
+        """Change a row's description."""
+        self._invalidate()
+        self.descriptions[row] = description
+    
+    def _invalidate(self) -> None:
+        """Drop cached columns derived from the rows."""
+        self._search_text = None
+    
+    def _reindex(self, key: str) -> None:
+        """Point an unindexed title at another row that still holds it.
+        
+        Only titles that have collided need the scan; a unique title has
+        no other row to move to.
+        """
+        if key not in self._shared_keys or key in self.index:
+            return
+        try:
+            self.index[key] = self.title_lower.index(key)
+        except ValueError:
+            self._shared_keys.discard(key)
+    
+    def find_by_title(self, title: str) -> Optional[int]:
+        """Return the row holding a title, ignoring case, or None.
+        
+        Always uses the hash index: a linear scan of `title_lower` was
+        measured slower even for a handful of tasks.
+        """
+        return self.index.get(title.lower())
+    
+    @property
+    def search_text(self) -> List[str]:
+        """Lowercase title, description and category of each row.
+        
+        The fields are joined with newlines, which a search term typed
+        at the prompt cannot contain, so a match never spans two fields.
+        Built on first use and cached until the store is next changed.
+        """
+        if self._search_text is None:
+            self._search_text = [
+                f"{title}\n{(description or '').lower()}\n{category.lower()}"
+                for title, description, category in
+                zip(self.title_lower, self.descriptions, self.categories)
+            ]
+        return self._search_text
+    
+    def mark_dirty(self) -> None:
+        """Record that the store has changes not yet saved to disk."""
+        self._dirty = True
+    
+    def flush(self) -> None:
+        """Save the store to disk if it has unsaved changes.
+        
+        The store stays dirty if the save fails, so a later flush retries.
+        """
+        if self._dirty and save_tasks(self):
+            self._dirty = False
+
 # File to store tasks
 TASK_FILE = "tasks.json"
 BACKUP_DIR = ".backups"
+# Seconds between periodic saves of unsaved changes
+FLUSH_INTERVAL = 5
+
+# Row selectors for the fixed view_tasks filters
+FILTER_FUNCS = {
+    "completed": lambda s: list(compress(range(len(s)), s.completed)),
+    "pending": lambda s: list(compress(range(len(s)), map(not_, s.completed))),
+}
+
+
+# One task as json.dumps(..., indent=4) lays it out inside the task list
+_TASK_TEMPLATE = (
+    '    {\n'
+    '        "title": %s,\n'
+    '        "completed": %s,\n'
+    '        "priority": "%s",\n'
+    '        "due_date": %s,\n'
+    '        "category": %s,\n'
+    '        "description": %s,\n'
+    '        "color": %s\n'
+    '    }'
+)
+
+def _encode_optional(value: Optional[str]) -> str:
+    """Encode an optional string field as a JSON literal."""
+    return "null" if value is None else encode_basestring_ascii(value)
+
+def _dumps(store: TaskStore) -> bytes:
+    """Serialize a TaskStore to indented JSON bytes.
+
+    Rows are encoded straight from the store's columns without building
+    Task objects. With orjson each row becomes a plain dict; otherwise
+    rows are filled into `_TASK_TEMPLATE` using the json module's C
+    string escaper, which matches json.dumps(indent=4) output without
+    its pure-Python indenting encoder.
+    """
+    rows = zip(store.titles, store.completed, store.priorities,
+               store.due_dates, store.categories, store.descriptions,
+               store.colors)
+    if orjson is not None:
+        return orjson.dumps([
+            {"title": title, "completed": bool(completed),
+             "priority": PRIORITY_NAMES[priority], "due_date": due_date,
+             "category": category, "description": description,
+             "color": color}
+            for title, completed, priority, due_date, category, description, color
+            in rows
+        ], option=orjson.OPT_INDENT_2)
+    if not store:
+        return b"[]"
+    tasks = [
+        _TASK_TEMPLATE % (
+            encode_basestring_ascii(title),
+            "true" if completed else "false",
+            PRIORITY_NAMES[priority],
+            _encode_optional(due_date),
+            encode_basestring_ascii(category),
+            _encode_optional(description),
+            _encode_optional(color),
+        )
+        for title, completed, priority, due_date, category, description, color
+        in rows
+    ]
+    return ("[\n" + ",\n".join(tasks) + "\n]").encode("utf-8")
+
+def _loads(raw: bytes) -> List[Dict]:
+    """Parse JSON bytes produced by `_dumps`."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _iter_loads(f: BinaryIO) -> Iterator[Dict]:
+    """Yield task dicts from an open JSON file.
+
+    Streams items one at a time with ijson when it is installed, so no
+    intermediate list of every task is built; otherwise parses the whole
+    file with `_loads`.
+    """
+    if ijson is not None:
+        return ijson.items(f, "item")
+    return iter(_loads(f.read()))
 
+# Errors raised by the JSON parsers for malformed input. orjson's
+# JSONDecodeError subclasses json.JSONDecodeError.
+_JSON_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+if ijson is not None:
+    _JSON_ERRORS += (ijson.JSONError,)
 
-def create_task_index(tasks: List[Task]) -> Dict[str, int]:
-    """Create an index of task titles for faster lookups.
-    
-    Args:
-        tasks: List of Task objects to index.
-        
-    Returns:
-        A dictionary mapping lowercase task titles to their indices.
-    """
-    return {t.title.lower(): i for i, t in enumerate(tasks)}
 
-def validate_task_title(title: str, tasks: List[Task], task_index: Optional[Dict[str, int]] = None) -> str:
+def validate_task_title(title: str, store: TaskStore,
+                        row: Optional[int] = None) -> str:
     """Validate the task title and check for duplicates.
     
     Args:
         title: The task title to validate.
-        tasks: List of existing tasks to check for duplicates.
-        task_index: Optional pre-computed index of task titles for faster lookups.
+        store: TaskStore holding the existing tasks.
+        row: Row being renamed, if any. Its own current title does not
+            count as a duplicate.
     
     Returns:
         The validated and stripped title string.
@@ -87,63 +398,74 @@ def validate_task_title(title: str, tasks: List[Task], task_index: Optional[Dict
     if not title.strip():
         raise ValueError("⚠️ Task title cannot be empty.")
         
-    # Use the index if provided, otherwise do a one-time check
-    if task_index is not None:
-        if title.lower() in task_index:
-            raise ValueError("⚠️ Task already exists.")
-    else:
-        title_lower = title.lower()
-        if any(t['title'].lower() == title_lower for t in tasks):
-            raise ValueError("⚠️ Task already exists.")
+    existing = store.find_by_title(title.strip())
+    if existing is not None and existing != row:
+        raise ValueError("⚠️ Task already exists.")
     return title.strip()
 
-def load_tasks() -> List[Task]:
+def load_tasks() -> TaskStore:
     """Load tasks from the JSON file.
     
     Returns:
-        A list of Task objects loaded from the JSON file.
-        Returns an empty list if the file doesn't exist or is invalid.
+        A TaskStore holding the tasks loaded from the JSON file.
+        Returns an empty store if the file doesn't exist or is not valid
+        JSON.
+    
+    Raises:
+        ValueError: If a task record is invalid, e.g. has an unknown
+            priority. The file is left untouched rather than replaced.
     
     Note:
         Automatically adds default values for missing task fields.
     """
     try:
-        with open(TASK_FILE, "r") as f:
-            data = json.load(f)
-            return [Task.from_dict(task_data) for task_data in data]
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+        with open(TASK_FILE, "rb") as f:
+            return TaskStore(Task.from_dict(task_data) for task_data in _iter_loads(f))
+    except (FileNotFoundError, *_JSON_ERRORS):
+        return TaskStore()
 
-def save_tasks(tasks: List[Task]) -> None:
+def save_tasks(store: TaskStore) -> bool:
     """Save tasks to file with automatic backup mechanism.
     
     Args:
-        tasks: List of Task objects to save.
+        store: TaskStore to save.
+    
+    Returns:
+        True if the tasks file was replaced, False if the save failed.
         
     Note:
-        Creates a timestamped backup before saving.
-        Attempts to restore from backup if save fails.
+        Creates at most one timestamped backup per hour before saving.
+        The backup is a hard link to the current file, falling back to a
+        copy where links are unsupported. New contents are written to a
+        temporary file and renamed over the old one, so a failed save
+        leaves the previous file intact.
     """
     
-    # Create backup
-    if os.path.exists(TASK_FILE):
-        backup_file = f"{TASK_FILE}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
+    # Create backup, named by the hour so later saves reuse it
+    backup_file = f"{TASK_FILE}.{datetime.now().strftime('%Y%m%d_%H')}.bak"
+    if os.path.exists(TASK_FILE) and not os.path.exists(backup_file):
         try:
-            copy2(TASK_FILE, backup_file)
-        except Exception as e:
-            print(f"⚠️ Warning: Could not create backup: {e}")
+            os.link(TASK_FILE, backup_file)
+        except OSError:
+            try:
+                copy2(TASK_FILE, backup_file)
+            except Exception as e:
+                print(f"⚠️ Warning: Could not create backup: {e}")
     
+    tmp_file = f"{TASK_FILE}.tmp"
     try:
-        with open(TASK_FILE, "w") as f:
-            json.dump(tasks, f, indent=4)
+        with open(tmp_file, "wb") as f:
+            f.write(_dumps(store))
+        os.replace(tmp_file, TASK_FILE)
+        return True
     except Exception as e:
         print(f"❌ Error saving tasks: {e}")
-        if os.path.exists(backup_file):
+        if os.path.exists(tmp_file):
             try:
-                copy2(backup_file, TASK_FILE)
-                print("✅ Restored from backup.")
-            except Exception as e:
-                print(f"❌ Error restoring backup: {e}")
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        return False
     
 
 def display_menu() -> None:
@@ -168,63 +490,62 @@ def display_menu() -> None:
     print("14. Exit")
 
 
-def view_tasks(tasks: List[Task], filter_by: Optional[str] = None) -> None:
+def view_tasks(store: TaskStore, filter_by: Optional[str] = None,
+               rows: Optional[List[int]] = None) -> None:
     """Display tasks with optional filtering.
     
     Args:
-        tasks: List of Task objects to display.
+        store: TaskStore to display.
         filter_by: Optional filter string in the format:
             - "completed" - show only completed tasks
             - "pending" - show only pending tasks
             - "priority:value" - show tasks with specific priority
             - "category:value" - show tasks in specific category
+        rows: Optional row numbers to display, in display order.
+            Defaults to every row in the store.
     
     Note:
-        Uses dictionary-based filtering for efficiency.
+        Filters sweep a single column of the store.
         Shows task status, priority, title, category and due date.
     """
-    if not tasks:
+    if not store:
         print("\n❌ No tasks in your list!")
         return
 
-    # Use dictionary-based filtering for better efficiency
-    filter_funcs = {
-        "completed": lambda tasks: {i: t for i, t in enumerate(tasks) if t["completed"]},
-        "pending": lambda tasks: {i: t for i, t in enumerate(tasks) if not t["completed"]},
-    }
-    
-    filtered_tasks = {}
+    if rows is None:
+        rows = list(range(len(store)))
     if filter_by:
-        if filter_by in filter_funcs:
-            filtered_tasks = filter_funcs[filter_by](tasks)
-        elif filter_by.startswith(("priority:", "category:")):
-            filter_type, value = filter_by.split(":")
-            key = filter_type.rstrip(":")
-            filtered_tasks = {i: t for i, t in enumerate(tasks) if t[key] == value}
-    else:
-        filtered_tasks = {i: t for i, t in enumerate(tasks)}
+        if filter_by in FILTER_FUNCS:
+            rows = FILTER_FUNCS[filter_by](store)
+        elif filter_by.startswith("priority:"):
+            code = PRIORITY_NAMES.index(filter_by.split(":", 1)[1])
+            rows = [i for i, p in enumerate(store.priorities) if p == code]
+        elif filter_by.startswith("category:"):
+            value = filter_by.split(":", 1)[1]
+            rows = [i for i, c in enumerate(store.categories) if c == value]
+        else:
+            rows = []
 
-    if not filtered_tasks:
+    if not rows:
         print("\n❌ No tasks match your filter!")
         return
         
-    # Pre-define constant mappings outside the loop
-    priority_icon = {"high": "🔴", "medium": "🟡", "low": "🟢"}
-    
-    print("\n📋 Your To-Do List:")
-    for i, task in filtered_tasks.items():
-        status = "✅" if task["completed"] else "❌"
-        priority = priority_icon.get(task["priority"], "⚪")
-        due = f"📅 {task['due_date']}" if task["due_date"] else ""
-        category = f"[{task['category']}]"
-        print(f"{i + 1}. {status} {priority} {task['title']} {category} {due}")
-
-
-def add_task(tasks: List[Task]) -> None:
+    # Build the whole listing and write it in one call
+    lines = ["\n📋 Your To-Do List:"]
+    for i in rows:
+        status = "✅" if store.completed[i] else "❌"
+        priority = PRIORITY_ICONS[store.priorities[i]]
+        due = f"📅 {store.due_dates[i]}" if store.due_dates[i] else ""
+        category = f"[{store.categories[i]}]"
+        lines.append(f"{i + 1}. {status} {priority} {store.titles[i]} {category} {due}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def add_task(store: TaskStore) -> None:
     """Add a new task with user-provided details.
     
     Args:
-        tasks: List of existing Task objects to append to.
+        store: TaskStore to append to.
     
     Note:
         Prompts user for:
@@ -233,20 +554,16 @@ def add_task(tasks: List[Task]) -> None:
         - Due date (optional, YYYY-MM-DD format)
         - Category (optional, defaults to "general")
         
-    Automatically saves tasks after successful addition.
+    Marks the store for saving after successful addition.
     """
     try:
-        # Create index once for faster lookups
-        task_index = create_task_index(tasks)
-        
         title = input("Enter the task: ").strip()
-        validate_task_title(title, tasks, task_index)
+        validate_task_title(title, store)
         
         # Get priority using predefined mapping
         print("\nPriority levels: 1=Low, 2=Medium, 3=High")
         priority = input("Enter priority (1-3) [2]: ").strip() or "2"
-        priority_map = {"1": "low", "2": "medium", "3": "high"}
-        if priority not in priority_map:
+        if priority not in PRIORITY_CHOICES:
             raise ValueError("⚠️ Invalid priority level!")
             
         # Get due date
@@ -260,53 +577,56 @@ def add_task(tasks: List[Task]) -> None:
         # Get category
         category = input("Enter category [general]: ").strip() or "general"
         
-        new_task = {
-            "title": title,
-            "completed": False,
-            "priority": priority_map[priority],
-            "due_date": due_date or None,
-            "category": category
-        }
+        new_task = Task(
+            title=title,
+            priority=PRIORITY_CHOICES[priority],
+            due_date=due_date or None,
+            category=category
+        )
         
-        tasks.append(new_task)
-        save_tasks(tasks)
+        store.append(new_task)
+        store.mark_dirty()
         print(f"✅ Task '{title}' added successfully!")
         
     except ValueError as e:
         print(str(e))
 
-def delete_task(tasks: List[Task]) -> None:
+def delete_task(store: TaskStore) -> None:
     """Delete a task from the list.
     
     Args:
-        tasks: List of Task objects to delete from.
+        store: TaskStore to delete from.
         
     Note:
         Shows current tasks and prompts for task number.
-        Automatically saves tasks after successful deletion.
+        Marks the store for saving after successful deletion.
     """
-    view_tasks(tasks)
+    view_tasks(store)
     try:
         task_num = int(input("\nEnter task number to remove: ")) - 1
-        if 0 <= task_num < len(tasks):
-            removed = tasks.pop(task_num)
-            save_tasks(tasks)
+        if 0 <= task_num < len(store):
+            removed = store.pop(task_num)
+            store.mark_dirty()
             print(f"✅ Removed task: {removed.title}")
         else:
             print("⚠️ Invalid task number!")
     except ValueError:
         print("⚠️ Please enter a valid number!")
   
-def update_task(tasks: List[Task]) -> None:
-    """Update an existing task."""
-    if not tasks:
+def update_task(store: TaskStore) -> None:
+    """Update an existing task.
+    
+    Args:
+        store: TaskStore to modify.
+    """
+    if not store:
         print("\n❌ No tasks in your list!")
         return
     
-    view_tasks(tasks)
+    view_tasks(store)
     try:
         task_num = int(input("\nEnter task number to update: ")) - 1
-        if not (0 <= task_num < len(tasks)):
+        if not (0 <= task_num < len(store)):
             print("⚠️ Invalid task number!")
             return
 
@@ -321,39 +641,37 @@ def update_task(tasks: List[Task]) -> None:
         
         if choice == "1":
             new_title = input("Enter new title: ").strip()
-            task_index = {t.title.lower(): i for i, t in enumerate(tasks) if i != task_num}
-            validate_task_title(new_title, tasks, task_index)
-            tasks[task_num].title = new_title
+            validate_task_title(new_title, store, task_num)
+            store.set_title(task_num, new_title)
         
         elif choice == "2":
             print("\nPriority levels: 1=Low, 2=Medium, 3=High")
             priority = input("Enter priority (1-3): ").strip()
-            priority_map = {"1": Priority.LOW, "2": Priority.MEDIUM, "3": Priority.HIGH}
-            if priority not in priority_map:
+            if priority not in PRIORITY_CHOICES:
                 raise ValueError("⚠️ Invalid priority level!")
-            tasks[task_num].priority = priority_map[priority]
+            store.set_priority(task_num, PRIORITY_CHOICES[priority])
         
         elif choice == "3":
             due_date = input("Enter due date (YYYY-MM-DD) [optional]: ").strip()
             if due_date:
                 datetime.strptime(due_date, "%Y-%m-%d")
-            tasks[task_num].due_date = due_date or None
+            store.set_due_date(task_num, due_date or None)
         
         elif choice == "4":
             category = input("Enter new category: ").strip()
             if not category:
                 raise ValueError("⚠️ Category cannot be empty!")
-            tasks[task_num].category = category
+            store.set_category(task_num, category)
         
         elif choice == "5":
             description = input("Enter new description [optional]: ").strip()
-            tasks[task_num].description = description or None
+            store.set_description(task_num, description or None)
         
         else:
             print("⚠️ Invalid choice!")
             return
         
-        save_tasks([t.to_dict() for t in tasks])
+        store.mark_dirty()
         print("✅ Task updated successfully!")
         
     except ValueError as e:
@@ -361,42 +679,56 @@ def update_task(tasks: List[Task]) -> None:
     except Exception as e:
         print(f"❌ Error: {str(e)}")
 
-def toggle_task_completion(tasks: List[Task]) -> None:
+def toggle_task_completion(store: TaskStore) -> None:
     """Toggle the completion status of a task.
     
     Args:
-        tasks: List of Task objects to modify.
+        store: TaskStore to modify.
         
     Note:
         Shows current tasks and prompts for task number.
         Toggles between completed and pending states.
-        Automatically saves tasks after toggling.
+        Marks the store for saving after toggling.
     """
-    if not tasks:
+    if not store:
         print("\n❌ No tasks in your list!")
         return
         
-    view_tasks(tasks)
+    view_tasks(store)
     try:
         task_num = int(input("\nEnter task number to toggle completion: ")) - 1
-        if 0 <= task_num < len(tasks):
-            tasks[task_num]["completed"] = not tasks[task_num]["completed"]
-            status = "completed" if tasks[task_num]["completed"] else "pending"
-            save_tasks(tasks)
+        if 0 <= task_num < len(store):
+            store.set_completed(task_num, not store.completed[task_num])
+            status = "completed" if store.completed[task_num] else "pending"
+            store.mark_dirty()
             print(f"✅ Task marked as {status}!")
         else:
             print("⚠️ Invalid task number!")
     except ValueError:
         print("⚠️ Please enter a valid number!")
 
-def sort_tasks(tasks: List[Task]) -> None:
+def argsort(keys: Sequence, reverse: bool = False) -> List[int]:
+    """Return the row numbers that would sort a key column.
+
+    Args:
+        keys: A column of sort keys, one per row.
+        reverse: Whether to sort in descending order.
+
+    Returns:
+        Row numbers ordered by their keys. Equal keys keep their original
+        order.
+    """
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+def sort_tasks(store: TaskStore) -> None:
     """Sort tasks by various criteria.
 
     Present a menu to choose sorting by due date, priority, title, or
-    category and display the sorted tasks.
+    category and display the sorted tasks. Only the display order is
+    sorted; the stored rows keep their positions.
 
     Args:
-        tasks: List of Task objects to sort and display.
+        store: TaskStore to sort and display.
 
     Returns:
         None
@@ -410,63 +742,62 @@ def sort_tasks(tasks: List[Task]) -> None:
     choice = input("Enter your choice: ").strip()
     
     if choice == "1":
-        sorted_tasks = sorted(tasks, key=lambda x: x.due_date or "9999-99-99")
+        rows = argsort([d or "9999-99-99" for d in store.due_dates])
     elif choice == "2":
-        priority_order = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
-        sorted_tasks = sorted(tasks, key=lambda x: priority_order[x.priority])
+        # Highest priority first; reversed sorts are still stable
+        rows = argsort(store.priorities, reverse=True)
     elif choice == "3":
-        sorted_tasks = sorted(tasks, key=lambda x: x.title.lower())
+        rows = argsort(store.title_lower)
     elif choice == "4":
-        sorted_tasks = sorted(tasks, key=lambda x: x.category.lower())
+        rows = argsort([c.lower() for c in store.categories])
     else:
         print("⚠️ Invalid choice!")
         return
         
-    view_tasks(sorted_tasks)
+    view_tasks(store, rows=rows)
 
-def show_statistics(tasks: List[Task]) -> None:
+def show_statistics(store: TaskStore) -> None:
     """Show statistics for the task list.
 
     Print overall counts and breakdowns by priority and category.
 
     Args:
-        tasks: List of Task objects to analyze.
+        store: TaskStore to analyze.
 
     Returns:
         None
     """
-    total = len(tasks)
-    completed = sum(1 for t in tasks if t.completed)
+    total = len(store)
+    completed = sum(store.completed)
     pending = total - completed
     
-    by_priority = {p: sum(1 for t in tasks if t.priority == p) for p in Priority}
-    by_category = {}
-    for t in tasks:
-        by_category[t.category] = by_category.get(t.category, 0) + 1
+    # One counting pass per column
+    priority_counts = Counter(store.priorities)
+    by_priority = {p: priority_counts[PRIORITY_CODES[p]] for p in Priority}
+    by_category = Counter(store.categories)
     
-    print("\n📊 Task Statistics")
-    print(f"Total tasks: {total}")
     completed_pct = (completed/total*100) if total > 0 else 0
     pending_pct = (pending/total*100) if total > 0 else 0
-    print(f"Completed: {completed} ({completed_pct:.1f}%)")
-    print(f"Pending: {pending} ({pending_pct:.1f}%)")
-    
-    print("\nBy Priority:")
-    for p, count in by_priority.items():
-        print(f"{p.value}: {count}")
-    
-    print("\nBy Category:")
-    for cat, count in by_category.items():
-        print(f"{cat}: {count}")
-
-def search_tasks(tasks: List[Task]) -> None:
+    lines = [
+        "\n📊 Task Statistics",
+        f"Total tasks: {total}",
+        f"Completed: {completed} ({completed_pct:.1f}%)",
+        f"Pending: {pending} ({pending_pct:.1f}%)",
+        "\nBy Priority:",
+    ]
+    lines.extend(f"{p.value}: {count}" for p, count in by_priority.items())
+    lines.append("\nBy Category:")
+    lines.extend(f"{cat}: {count}" for cat, count in by_category.items())
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def search_tasks(store: TaskStore) -> None:
     """Search tasks by keyword.
     
     Prompts user for a search term and displays all tasks matching that term
     in title, description, or category fields.
     
     Args:
-        tasks: List of Task objects to search through.
+        store: TaskStore to search through.
         
     Returns:
         None
@@ -476,17 +807,17 @@ def search_tasks(tasks: List[Task]) -> None:
         print("⚠️ Search term cannot be empty!")
         return
         
-    matches = [t for t in tasks if 
-              keyword in t.title.lower() or 
-              (t.description and keyword in t.description.lower()) or
-              keyword in t.category.lower()]
-              
+    # Test every row without running Python bytecode per row
+    haystacks = store.search_text
+    matches = list(compress(range(len(haystacks)),
+                            map(contains, haystacks, repeat(keyword))))
+
     if matches:
-        view_tasks(matches)
+        view_tasks(store, rows=matches)
     else:
         print("❌ No matching tasks found!")
 
-def export_tasks(tasks: List[Task]) -> None:
+def export_tasks(store: TaskStore) -> None:
     """Export tasks to different formats.
 
     Prompt the user to choose an export format and write the provided tasks
@@ -494,7 +825,7 @@ def export_tasks(tasks: List[Task]) -> None:
     text.
 
     Args:
-        tasks (List[Task]): Tasks to export.
+        store (TaskStore): Tasks to export.
 
     Returns:
         None
@@ -511,26 +842,35 @@ def export_tasks(tasks: List[Task]) -> None:
     try:
         if choice == "1":
             filename = "tasks_export.csv"
-            with open(filename, 'w') as f:
-                f.write("Title,Status,Priority,Due Date,Category,Description\n")
-                for task in tasks:
-                    status = "Completed" if task.completed else "Pending"
-                    f.write(f'"{task.title}",{status},{task.priority.value},' +
-                           f'"{task.due_date or ""}","{task.category}",' +
-                           f'"{task.description or ""}"\n')
+            statuses = ("Pending", "Completed")
+            rows = zip(
+                store.titles,
+                (statuses[done] for done in store.completed),
+                (PRIORITY_NAMES[p] for p in store.priorities),
+                (d or "" for d in store.due_dates),
+                store.categories,
+                (d or "" for d in store.descriptions),
+            )
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["Title", "Status", "Priority", "Due Date",
+                                 "Category", "Description"])
+                writer.writerows(rows)
         elif choice == "2":
             filename = "tasks_export.txt"
+            lines = []
+            for task in store:
+                status = "✅" if task.completed else "❌"
+                lines.append(f"{status} {task.title}")
+                lines.append(f"Priority: {task.priority.value}")
+                if task.due_date:
+                    lines.append(f"Due: {task.due_date}")
+                lines.append(f"Category: {task.category}")
+                if task.description:
+                    lines.append(f"Description: {task.description}")
+                lines.append("")
             with open(filename, 'w') as f:
-                for task in tasks:
-                    status = "✅" if task.completed else "❌"
-                    f.write(f"{status} {task.title}\n")
-                    f.write(f"Priority: {task.priority.value}\n")
-                    if task.due_date:
-                        f.write(f"Due: {task.due_date}\n")
-                    f.write(f"Category: {task.category}\n")
-                    if task.description:
-                        f.write(f"Description: {task.description}\n")
-                    f.write("\n")
+                f.write("".join(line + "\n" for line in lines))
         else:
             print("⚠️ Invalid choice!")
             return
@@ -539,6 +879,15 @@ def export_tasks(tasks: List[Task]) -> None:
     except Exception as e:
         print(f"❌ Error exporting tasks: {e}")
 
+def _exit_on_signal(signum: int, frame: object) -> None:
+    """Turn a termination signal into a normal exit.
+    
+    Raising SystemExit unwinds the program so the atexit flush of unsaved
+    changes still runs, which it would not if the signal killed the
+    process outright.
+    """
+    sys.exit(128 + signum)
+
 def main() -> None:
     """Main program loop.
     
@@ -546,44 +895,50 @@ def main() -> None:
     Handles all user input and menu selections.
     Catches and reports any errors that occur during operation.
     """
-    tasks = load_tasks()
+    store = load_tasks()
+    atexit.register(store.flush)
+    # Closing the terminal (SIGHUP) or SIGTERM must not drop unsaved edits
+    for name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _exit_on_signal)
+    last_flush = time.monotonic()
     while True:
         display_menu()
         choice = input("Enter your choice: ").strip()
         
         try:
             if choice == "1":
-                add_task(tasks)
+                add_task(store)
             elif choice == "2":
-                view_tasks(tasks)
+                view_tasks(store)
             elif choice == "3":
-                view_tasks(tasks, filter_by="pending")
+                view_tasks(store, filter_by="pending")
             elif choice == "4":
-                view_tasks(tasks, filter_by="completed")
+                view_tasks(store, filter_by="completed")
             elif choice == "5":
-                toggle_task_completion(tasks)
+                toggle_task_completion(store)
             elif choice == "6":
-                delete_task(tasks)
+                delete_task(store)
             elif choice == "7":
-                update_task(tasks)
+                update_task(store)
             elif choice == "8":
                 print("\nPriority levels: low, medium, high")
                 priority = input("Enter priority to filter: ").strip().lower()
-                if priority in ["low", "medium", "high"]:
-                    view_tasks(tasks, filter_by=f"priority:{priority}")
+                if priority in PRIORITY_NAMES:
+                    view_tasks(store, filter_by=f"priority:{priority}")
                 else:
                     print("⚠️ Invalid priority level!")
             elif choice == "9":
                 category = input("Enter category to filter: ").strip().lower()
-                view_tasks(tasks, filter_by=f"category:{category}")
+                view_tasks(store, filter_by=f"category:{category}")
             elif choice == "10":
-                sort_tasks(tasks)
+                sort_tasks(store)
             elif choice == "11":
-                show_statistics(tasks)
+                show_statistics(store)
             elif choice == "12":
-                search_tasks(tasks)
+                search_tasks(store)
             elif choice == "13":
-                export_tasks(tasks)
+                export_tasks(store)
             elif choice == "14":
                 print("👋 Goodbye!")
                 break
@@ -591,7 +946,11 @@ def main() -> None:
                 print("⚠️ Invalid choice. Please try again.")
         except Exception as e:
             print(f"❌ Error: {str(e)}")
-            continue
+        
+        # Save pending changes periodically rather than after every edit
+        if time.monotonic() - last_flush > FLUSH_INTERVAL:
+            store.flush()
+            last_flush = time.monotonic()
 
 if __name__ == "__main__":
   main()